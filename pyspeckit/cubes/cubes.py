@@ -125,6 +125,19 @@ def baseline_cube(cube, polyorder=None, cubemask=None, splineorder=None,
         the number of available cores.
     """
     x = np.arange(cube.shape[0], dtype=cube.dtype)
+
+    if (polyorder is not None and splineorder is None and cubemask is None
+            and sampling == 1 and not np.ma.is_masked(cube)
+            and not np.isnan(cube).any()):
+        # all spectra share the same x, weights, and (absent) mask, so the
+        # whole cube can be fit with one vectorized least-squares solve
+        # instead of one Python-level fit per spectrum
+        cube2d = cube.reshape(cube.shape[0], -1)
+        coeffs = np.polynomial.polynomial.polyfit(x, cube2d, polyorder)
+        model = np.polynomial.polynomial.polyval(x, coeffs, tensor=True)
+        return (cube2d - model.T).reshape(cube.shape).astype(cube.dtype,
+                                                             copy=False)
+
     #polyfitfunc = lambda y: np.polyfit(x, y, polyorder)
     blfunc = blfunc_generator(x=x,
                               splineorder=splineorder,
@@ -718,8 +731,6 @@ def spectral_smooth(cube, smooth_factor, downsample=True, parallel=True,
     Smooth the cube along the spectral direction
     """
 
-    yy,xx = numpy.indices(cube.shape[1:])
-
     if downsample:
         newshape = cube[::smooth_factor,:,:].shape
     else:
@@ -735,6 +746,7 @@ def spectral_smooth(cube, smooth_factor, downsample=True, parallel=True,
         newcube = numpy.array(map(Ssmooth, cube.reshape(flatshape).T)).T.reshape(newshape)
 
     #naive, non-optimal version
+    # yy,xx = numpy.indices(cube.shape[1:])
     # for (x,y) in zip(xx.flat,yy.flat):
     #     newcube[:,y,x] = smooth.smooth(cube[:,y,x], smooth_factor,
     #             downsample=downsample, **kwargs)
@@ -10,6 +10,23 @@ from . import models
 from astropy import log
 import copy
 
+def _polyval_pars(pars, x):
+    """
+    Evaluate a polynomial with ``np.poly1d``-ordered (descending)
+    coefficients.  High-order polynomials are split into even and odd
+    sub-series evaluated in x**2, which halves the length of the
+    sequentially dependent Horner chain and lets the two halves be
+    computed independently.
+    """
+    if len(pars) < 9:
+        return np.polyval(pars, x)
+    ascending = np.asarray(pars)[::-1]
+    x2 = x*x
+    even = np.polynomial.polynomial.polyval(x2, ascending[0::2])
+    odd = np.polynomial.polynomial.polyval(x2, ascending[1::2])
+    return even + x*odd
+
+
 interactive_help_message = """
 (1) Left-click or press 1 (one) at two positions to select or add to the baseline fitting range - it will be
 highlighted in green if the selection is successful.
@@ -68,6 +85,11 @@ class Baseline(interactive.Interactive):
         self.spline=False
         self._xfit_units = None
         self._plots = []
+        self._xarr_cache = None
+        self._xarr_cache_key = None
+        self._spectofit_buf = None
+        self._vander = None
+        self._vander_key = None
 
     @cfgdec
     def __call__(self, order=1, excludefit=False, save=True, exclude=None,
@@ -130,7 +152,19 @@ class Baseline(interactive.Interactive):
         specfit = self.Spectrum.specfit
         self.order = order
         self.set_spectofit(fit_original=fit_original)
-        self.OKmask = (self.spectofit==self.spectofit)
+        spectofit = self.spectofit
+        if type(spectofit) is np.ndarray and spectofit.dtype.kind == 'f':
+            # not-NaN mask, written into the existing buffer when possible
+            okmask = self.OKmask
+            if (type(okmask) is not np.ndarray or
+                    okmask.shape != spectofit.shape or
+                    okmask.dtype != np.bool_):
+                okmask = np.empty(spectofit.shape, dtype='bool')
+            np.isnan(spectofit, out=okmask)
+            np.logical_not(okmask, out=okmask)
+            self.OKmask = okmask
+        else:
+            self.OKmask = (spectofit==spectofit)
         if (isinstance(exclude, str) and (exclude == 'interactive')) or interactive:
             if np.all(self.includemask):
                 specwarnings.warn("Include mask was uniformly True.  \n"
@@ -189,12 +223,25 @@ class Baseline(interactive.Interactive):
         """
         Reset the spectrum-to-fit from the data
         """
+        data = self.Spectrum.data
         if fit_residuals:
             self.spectofit = self.Spectrum.specfit.residuals
+        elif type(data) is np.ndarray and data.dtype.kind == 'f':
+            # plain float data: fill a reusable buffer instead of allocating
+            # a fresh N-sized array on every fit
+            buf = self._spectofit_buf
+            if (buf is None or buf.shape != data.shape or
+                    buf.dtype != data.dtype):
+                buf = self._spectofit_buf = np.empty_like(data)
+            if self.subtracted and fit_original: # add back in the old baseline
+                np.add(data, self.basespec, out=buf)
+            else:
+                np.copyto(buf, data)
+            self.spectofit = buf
         elif self.subtracted and fit_original: # add back in the old baseline
-            self.spectofit = self.Spectrum.data+self.basespec
+            self.spectofit = data+self.basespec
         else:
-            self.spectofit = self.Spectrum.data.copy()
+            self.spectofit = data.copy()
 
     def fit(self, powerlaw=None, order=None, includemask=None, spline=False,
             spline_sampling=10, spline_downsampler=np.median,
@@ -247,7 +294,10 @@ class Baseline(interactive.Interactive):
         if debug:
             print("Button 2/3 Baseline.  Subtract={0}".format(subtract))
         if self.subtracted:
-            self.unsubtract()
+            # if the new fit is subtracted below, plot_baseline re-plots the
+            # data afterward anyway, so the intermediate re-plot of the
+            # unsubtracted spectrum is wasted work
+            self.unsubtract(replot=not subtract)
 
         # interactive guesspeakwidth passes this on; it should be excised
         if 'nwidths' in kwargs:
@@ -298,6 +348,35 @@ class Baseline(interactive.Interactive):
                                                            self.baselinepars]))
                                   + "(powerlaw)" if self.powerlaw else "")
 
+    def _xarr_as_unit(self, unit):
+        """
+        Return ``self.Spectrum.xarr`` converted to ``unit``.  The conversion
+        is cached, since the same converted axis is needed on every fit and
+        model evaluation.
+        """
+        xarr = self.Spectrum.xarr
+        # refX and the velocity convention affect frequency<->velocity
+        # conversions, so they must be part of the cache key
+        key = (str(xarr.unit), str(unit), xarr.size,
+               xarr[0].value, xarr[-1].value,
+               str(xarr.refX), xarr.velocity_convention)
+        if self._xarr_cache is None or self._xarr_cache_key != key:
+            self._xarr_cache = xarr.as_unit(unit)
+            self._xarr_cache_key = key
+        return self._xarr_cache
+
+    def _poly_vander(self, x, order):
+        """
+        Cached Vandermonde matrix for the polynomial baseline fit; reused
+        when the same x array and order are fit repeatedly (e.g. when
+        baselining many spectra on a shared axis).
+        """
+        key = (order, x.shape[0], x[0], x[-1])
+        if self._vander is None or self._vander_key != key:
+            self._vander = np.polynomial.polynomial.polyvander(x, order)
+            self._vander_key = key
+        return self._vander
+
     def set_basespec_frompars(self, baselinepars=None, xarr_fit_unit=None):
         """
         Set the baseline spectrum based on the fitted parameters
@@ -313,7 +392,7 @@ class Baseline(interactive.Interactive):
         if xarr_fit_unit == 'pixels':
             xarrconv = np.arange(self.Spectrum.data.size)
         elif xarr_fit_unit not in (None, 'native'):
-            xarrconv = self.Spectrum.xarr.as_unit(xarr_fit_unit)
+            xarrconv = self._xarr_as_unit(xarr_fit_unit)
         else:
             xarrconv = self.Spectrum.xarr
 
@@ -326,7 +405,7 @@ class Baseline(interactive.Interactive):
         # create the full baseline spectrum...
         fit_units = self._xfit_units
         if xarr is None:
-            xarr = self.Spectrum.xarr.as_unit(fit_units)
+            xarr = self._xarr_as_unit(fit_units)
         if baselinepars is None:
             baselinepars = self.baselinepars
         if baselinepars is None: # still...
@@ -337,7 +416,8 @@ class Baseline(interactive.Interactive):
                 raise ValueError("Infinite value encountered in power-law model")
             return result
         else:
-            return np.poly1d(baselinepars)(xarr)
+            # polyval's Horner loop avoids poly1d's per-power temporaries
+            return _polyval_pars(baselinepars, xarr)
 
 
     def button3action(self, *args, **kwargs):
@@ -381,42 +461,31 @@ class Baseline(interactive.Interactive):
                           self.Spectrum.plotter.axis.viewLim))
 
         # clear out the errorplot.  This should not be relevant...
+        # (Artist.remove detaches the artist from its container directly,
+        # without scanning the axis' artist lists)
         if self.Spectrum.plotter.errorplot is not None:
             for p in self.Spectrum.plotter.errorplot:
-                if isinstance(p,matplotlib.collections.PolyCollection):
-                    if p in self.Spectrum.plotter.axis.collections:
-                        try:
-                            self.Spectrum.plotter.axis.lines.remove(p)
-                        except AttributeError:
-                            try:
-                                p.remove()
-                            except Exception as ex:
-                                pass
-                if isinstance(p,matplotlib.lines.Line2D):
-                    if p in self.Spectrum.plotter.axis.lines:
-                        try:
-                            self.Spectrum.plotter.axis.lines.remove(p)
-                        except AttributeError:
-                            try:
-                                p.remove()
-                            except Exception as ex:
-                                pass
+                if isinstance(p, (matplotlib.collections.PolyCollection,
+                                  matplotlib.lines.Line2D)):
+                    try:
+                        p.remove()
+                    except Exception as ex:
+                        pass
 
         # if we subtract the baseline, replot the now-subtracted data with rescaled Y axes
         if self.subtracted:
             if self.Spectrum.plotter.axis is not None:
-                for p in self.Spectrum.plotter.axis.lines:
+                # iterate over a copy: removing mutates the axis' line list
+                for p in list(self.Spectrum.plotter.axis.lines):
                     try:
-                        self.Spectrum.plotter.axis.lines.remove(p)
-                    except AttributeError:
-                        try:
-                            p.remove()
-                        except Exception as ex:
-                            pass
-            plotmask = self.OKmask*False # include nothing...
+                        p.remove()
+                    except Exception as ex:
+                        pass
+            plotmask = np.zeros_like(self.OKmask) # include nothing...
             plotmask[self.xmin:self.xmax] = self.OKmask[self.xmin:self.xmax] # then include everything OK in range
-            self.Spectrum.plotter.ymin = abs(self.Spectrum.data[plotmask].min())*1.1*np.sign(self.Spectrum.data[plotmask].min())
-            self.Spectrum.plotter.ymax = abs(self.Spectrum.data[plotmask].max())*1.1*np.sign(self.Spectrum.data[plotmask].max())
+            plotdata = self.Spectrum.data[plotmask]
+            self.Spectrum.plotter.ymin = np.nanmin(plotdata)*1.1
+            self.Spectrum.plotter.ymax = np.nanmax(plotdata)*1.1
             # don't change the zoom (by default)!
             uwl = use_window_limits if use_window_limits is not None else self.use_window_limits
             self.Spectrum.plotter.plot(use_window_limits=uwl)
@@ -424,14 +493,10 @@ class Baseline(interactive.Interactive):
             self.Spectrum.plotter.axis.set_autoscale_on(False)
             for p in self._plots:
                 # remove the old baseline plots
-                if p in self.Spectrum.plotter.axis.lines:
-                    try:
-                        self.Spectrum.plotter.axis.lines.remove(p)
-                    except AttributeError:
-                        try:
-                            p.remove()
-                        except Exception as ex:
-                            pass
+                try:
+                    p.remove()
+                except Exception as ex:
+                    pass
             self._plots += self.Spectrum.plotter.axis.plot(
                     self.Spectrum.xarr,
                     self.basespec,
@@ -504,11 +569,10 @@ class Baseline(interactive.Interactive):
     def clearlegend(self):
         if self.blleg is not None:
             self.blleg.set_visible(False)
-            if self.blleg in self.Spectrum.plotter.axis.artists:
-                if hasattr(self.Spectrum.plotter.axis.artists, 'remove'):
-                    self.Spectrum.plotter.axis.artists.remove(self.blleg)
-                else:
-                    self.blleg.remove()
+            try:
+                self.blleg.remove()
+            except Exception:
+                pass
         if self.Spectrum.plotter.autorefresh: self.Spectrum.plotter.refresh()
 
     def savefit(self):
@@ -528,7 +592,8 @@ class Baseline(interactive.Interactive):
         masktoexclude : boolean array
             True: will not be fit
             False: will be fit
-            *if ALL are True, ALL pixels will be fit - just with silly weights*
+            Excluded samples are dropped before fitting rather than
+            down-weighted.
         """
 
         #if xmin == 'default':
@@ -549,15 +614,18 @@ class Baseline(interactive.Interactive):
             else:
                 xarrconv = np.arange(spectrum.size)
         elif xarr_fit_unit not in (None, 'native'):
-            xarrconv = xarr.as_unit(xarr_fit_unit).value
+            if xarr is self.Spectrum.xarr:
+                xarrconv = self._xarr_as_unit(xarr_fit_unit).value
+            else:
+                xarrconv = xarr.as_unit(xarr_fit_unit).value
         else:
             xarrconv = xarr
         log.debug("xarrconv = {0}".format(xarrconv))
         log.debug("xarr_fit_unit = {0}".format(xarr_fit_unit))
 
 
-        # A good alternate implementation of masking is to only pass mpfit the data
-        # that is unmasked.  That would require some manipulation above...
+        # masking works by passing the fitter only the unmasked (OK) samples;
+        # the masked ones never enter the fit
         if err is None:
             err = np.ma.ones(spectrum.shape)
         else:
@@ -576,11 +644,13 @@ class Baseline(interactive.Interactive):
         if masktoexclude is not None:
             if masktoexclude.dtype.name != 'bool':
                 masktoexclude = masktoexclude.astype('bool')
-            err[masktoexclude] = 1e10
-            err.mask |= masktoexclude
+            # the common "fit everything" case has nothing to exclude, so
+            # the mask merge can be skipped
+            if masktoexclude.any():
+                err.mask |= masktoexclude
             if LoudDebug:
                 print("In _baseline: %i points masked out" % masktoexclude.sum())
-        if (spectrum!=spectrum).sum() > 0:
+        if np.isnan(spectrum).any():
             print("There is an error in baseline: some values are NaN")
             import pdb; pdb.set_trace()
 
@@ -598,8 +668,15 @@ class Baseline(interactive.Interactive):
             if any(xarrconv == 0) or any(~np.isfinite(xarrconv)):
                 raise ValueError("Invalid value in x-axis being used for fitting.")
 
+            # the unmasked x values are a loop invariant; select them once
+            # rather than fancy-indexing on every mpfit iteration
+            xfit = xarrconv[OK]
+
             def mpfitfun(data, err):
                 #def f(p,fjac=None): return [0,np.ravel(((p[0] * (xarrconv[OK]-p[2])**(-p[1]))-data)/err)]
+                # the weight is also constant across iterations:
+                # (data - model)/(err/data) == (data - model) * (data/err)
+                weight = data / err
                 # Logarithmic fitting:
                 def f(params, fjac=None):
                     for pp in params:
@@ -609,24 +686,13 @@ class Baseline(interactive.Interactive):
                     #        np.ravel( (np.log10(data) - np.log10(p[0]) + p[1]*np.log10(xarrconv[OK]/p[2])) / (err/data) )
                     #        ]
                     rslt = np.ravel((data -
-                                     self.get_model(xarr=xarrconv[OK],
+                                     self.get_model(xarr=xfit,
                                                     baselinepars=params))
-                                    / (err/data))
+                                    * weight)
                     if np.any(np.isnan(rslt)):
                         raise ValueError("NaN in result")
                     return [0, rslt]
                 return f
-        else:
-            pguess = [0]*(order+1)
-            if LoudDebug:
-                print("_baseline Guesses: ",pguess)
-
-            parinfo = None
-
-            def mpfitfun(data,err):
-                def f(p,fjac=None):
-                    return [0,np.ravel((np.poly1d(p)(xarrconv[OK])-data)/err)]
-                return f
         #scalefactor = 1.0
         #if renormalize in ('auto',True):
         #    datarange = spectrum.max() - spectrum.min()
@@ -645,18 +711,37 @@ class Baseline(interactive.Interactive):
                              "report it as an Issue: "
                              "https://github.com/pyspeckit/pyspeckit/issues")
 
-        mp = mpfit.mpfit(mpfitfun(np.array(spectrum[OK]), np.array(err[OK])), xall=pguess,
-                         parinfo=parinfo,
-                         quiet=quiet)
-        if np.isnan(mp.fnorm):
-            raise ValueError("chi^2 is NAN in baseline fitting")
-        self.mpfit_status = models.mpfit_messages[mp.status]
-        log.debug("mpfit message: {0}".format(self.mpfit_status))
-        fitp = mp.params
         if powerlaw:
+            mp = mpfit.mpfit(mpfitfun(np.array(spectrum[OK]), np.array(err[OK])), xall=pguess,
+                             parinfo=parinfo,
+                             quiet=quiet)
+            if np.isnan(mp.fnorm):
+                raise ValueError("chi^2 is NAN in baseline fitting")
+            self.mpfit_status = models.mpfit_messages[mp.status]
+            log.debug("mpfit message: {0}".format(self.mpfit_status))
+            fitp = mp.params
             bestfit = (fitp[0]*(xarrconv)**(-fitp[1])).squeeze()
         else:
-            bestfit = np.poly1d(fitp)(xarrconv).squeeze()
+            # the polynomial baseline is linear in its coefficients, so a
+            # single weighted least-squares solve replaces the iterative
+            # Levenberg-Marquardt loop.  The Vandermonde matrix is cached,
+            # since it only depends on the x array and the order.
+            vander = self._poly_vander(np.asarray(xarrconv), order)
+            w = 1.0/np.asarray(err)[OK]
+            lhs = vander[OK] * w[:, np.newaxis]
+            rhs = np.asarray(spectrum)[OK] * w
+            # scale the columns, as np.polynomial's polyfit does, to keep
+            # the solve well-conditioned
+            scl = np.sqrt(np.square(lhs).sum(axis=0))
+            scl[scl == 0] = 1
+            rcond = len(rhs)*np.finfo(lhs.dtype).eps
+            coeffs = np.linalg.lstsq(lhs/scl, rhs, rcond=rcond)[0] / scl
+            # np.polynomial uses ascending coefficient order; everything
+            # downstream expects np.poly1d (descending) ordering
+            fitp = coeffs[::-1]
+            if np.any(np.isnan(fitp)):
+                raise ValueError("NaN in baseline fit parameters")
+            bestfit = _polyval_pars(fitp, xarrconv).squeeze()
 
         return bestfit,fitp
 
@@ -668,11 +753,15 @@ class Baseline(interactive.Interactive):
         self.basespec = self.basespec[x1pix:x2pix]
         self.includemask = self.includemask[x1pix:x2pix]
         self.OKmask = self.OKmask[x1pix:x2pix]
+        self._xarr_cache = None
+        self._xarr_cache_key = None
 
     def downsample(self,factor):
         self.basespec = self.basespec[::factor]
         self.includemask = self.includemask[::factor]
         self.OKmask = self.OKmask[::factor]
+        self._xarr_cache = None
+        self._xarr_cache_key = None
 
     def copy(self, parent=None):
         """
@@ -686,6 +775,13 @@ class Baseline(interactive.Interactive):
 
         newbaseline = copy.copy(self)
         newbaseline.Spectrum = parent
+        # don't share the fit buffers/caches with the original; they belong
+        # to the original's Spectrum
+        newbaseline._spectofit_buf = None
+        newbaseline._xarr_cache = None
+        newbaseline._xarr_cache_key = None
+        newbaseline._vander = None
+        newbaseline._vander_key = None
         newbaseline.OKmask = copy.copy( self.OKmask )
         newbaseline.basespec = copy.copy( self.basespec )
         newbaseline.baselinepars = copy.copy( self.baselinepars )
@@ -443,9 +443,11 @@ class BaseSpectrum(object):
         """
 
         # do slice (this code is redundant... need to figure out how to fix that)
+        # x_to_pix converts the scalar endpoint and binary-searches the axis,
+        # rather than converting/scanning the full axis per endpoint
         if not hasattr(x1, 'unit') and unit is not None:
-            x1pix = np.argmin(np.abs(x1-self.xarr.as_unit(unit).value))
-            x2pix = np.argmin(np.abs(x2-self.xarr.as_unit(unit).value))
+            x1pix = self.xarr.x_to_pix(x1, xval_unit=unit)
+            x2pix = self.xarr.x_to_pix(x2, xval_unit=unit)
         elif hasattr(x1, 'unit') and unit is not None:
             raise ValueError("If you give x1,x2 as quantities, don't specify "
                              "the X-axis unit (it must be equivalent, though).")
@@ -453,10 +455,8 @@ class BaseSpectrum(object):
             x1pix = x1
             x2pix = x2
         else:
-            # Hack: something about the inheritance of xarr prevents equivalent
-            # unit arithmetic
-            x1pix = np.argmin(np.abs(x1-u.Quantity(self.xarr)))
-            x2pix = np.argmin(np.abs(x2-u.Quantity(self.xarr)))
+            x1pix = self.xarr.x_to_pix(x1)
+            x2pix = self.xarr.x_to_pix(x2)
             x1 = x1.value
             x2 = x2.value
 
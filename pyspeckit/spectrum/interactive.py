@@ -174,10 +174,13 @@ class Interactive(object):
             if mark_include:
                 self.highlight_fitregion(**kwargs)
             else:  # mark include=False -> mark_exclude=True
+                # the click boundaries are the same for every highlight line
+                xlo = self.Spectrum.xarr[self._xclick1]
+                xhi = self.Spectrum.xarr[self._xclick2]
                 for highlight_line in self.button1plot:
                     hlx,hly = highlight_line.get_data()
-                    hide = ((hlx > self.Spectrum.xarr[self._xclick1]) *
-                            (hlx < self.Spectrum.xarr[self._xclick2]))
+                    hide = (hlx > xlo)
+                    hide &= (hlx < xhi)
                     hly[hide] = numpy.nan
                     highlight_line.set_ydata(hly)
                 self.Spectrum.plotter.refresh()
@@ -199,13 +202,13 @@ class Interactive(object):
         if clear_highlights:
             self.clear_highlights()
 
-        bad = self.Spectrum.data*0
-        bad[~self.includemask] = numpy.nan
+        # NaN out the points that are not to be included
+        ydata = self.Spectrum.data + self.Spectrum.plotter.offset
+        ydata[~self.includemask] = numpy.nan
 
         self.button1plot += self.Spectrum.plotter.axis.plot(
                 self.Spectrum.xarr,
-                # +bad adds nans to points that are not to be included
-                self.Spectrum.data+self.Spectrum.plotter.offset+bad,
+                ydata,
                 drawstyle=drawstyle, color=color,
                 linewidth=linewidth,
                 alpha=alpha,
@@ -220,10 +223,10 @@ class Interactive(object):
         self.Spectrum.plotter.axis.set_autoscale_on(False)
         if include_all:
             # default to including everything
-            self.includemask = numpy.array(self.Spectrum.data, dtype='bool') + True
+            self.includemask = numpy.ones(self.Spectrum.data.shape, dtype='bool')
         else:
             # default to including nothing
-            self.includemask = numpy.array(self.Spectrum.data, dtype='bool') * False
+            self.includemask = numpy.zeros(self.Spectrum.data.shape, dtype='bool')
 
     def guesspeakwidth(self,event,debug=False,nwidths=1,**kwargs):
         """
@@ -508,6 +511,11 @@ class Interactive(object):
         if (isinstance(exclude, str) and (exclude == 'interactive')):
             self.start_interactive()
         elif exclude is not None and len(exclude) % 2 == 0:
+            # stamp all exclusion intervals onto the mask in a single pass:
+            # +1/-1 deltas at the interval edges are cumulative-summed into a
+            # "depth" array that is positive inside any excluded interval
+            npix = self.includemask.size
+            delta = numpy.zeros(npix + 1, dtype='int')
             for x1,x2 in zip(exclude[::2],exclude[1::2]):
                 if xtype.lower() in ('wcs',) or xtype in units.xtype_dict:
                     x1 = self.Spectrum.xarr.x_to_pix(x1)
@@ -521,7 +529,16 @@ class Interactive(object):
                     if x1 > x2:
                         x1,x2 = x2,x1
                 log.debug("Exclusion pixels: {0} to {1}".format(x1,x2))
-                self.includemask[x1:x2] = False
+                # normalize like slice endpoints (negative = from the end)
+                x1,x2 = [min(max(x + npix, 0), npix) if x < 0 else min(x, npix)
+                         for x in (int(x1),int(x2))]
+                # inverted pixel pairs are empty slices; stamping them would
+                # cancel the depth of overlapping valid intervals
+                if x1 >= x2:
+                    continue
+                delta[x1] += 1
+                delta[x2] -= 1
+            self.includemask[numpy.cumsum(delta[:npix]) > 0] = False
         elif exclude is not None:
             log.error("An 'exclude' keyword was specified with an odd number "
                       "of parameters, which is not permitted.")
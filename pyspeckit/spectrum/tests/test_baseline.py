@@ -0,0 +1,31 @@
+import numpy as np
+import warnings
+
+from pyspeckit.spectrum import Spectrum
+
+
+def test_polynomial_baseline_with_exclude():
+    # a known quadratic baseline (in pixel units, the default fit axis)
+    # plus a line; the fit must recover the input coefficients with the
+    # line region excluded
+    dx = 0.1
+    x = np.arange(-6, 6, dx)
+    pix = np.arange(x.size)
+    truepars = [1e-3, -0.05, 2.0]
+    y = np.polyval(truepars, pix) + 5*np.exp(-x**2/(2.*0.5**2))
+    with warnings.catch_warnings():
+        # ignore warning about creating an empty header
+        warnings.simplefilter('ignore')
+        sp = Spectrum(xarr=x, data=y)
+    sp.baseline(exclude=[-3, 3], order=2, subtract=True)
+    np.testing.assert_allclose(sp.baseline.baselinepars, truepars,
+                               rtol=1e-6, atol=1e-8)
+    outside = (x < -3) | (x > 3)
+    assert np.abs(sp.data[outside]).max() < 1e-6
+
+    # refitting goes through the cached x-array and Vandermonde matrix;
+    # the result must not change
+    sp.baseline.unsubtract()
+    sp.baseline(exclude=[-3, 3], order=2, subtract=True)
+    np.testing.assert_allclose(sp.baseline.baselinepars, truepars,
+                               rtol=1e-6, atol=1e-8)
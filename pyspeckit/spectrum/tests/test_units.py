@@ -192,6 +192,35 @@ class TestUnits(object):
                                                  velocity_convention='radio')
         assert xarr.x_to_pix(100.001,u.GHz) == 23
 
+    def test_x_to_pix_monotonic(self):
+        # the binary-search fast path must match the brute-force nearest
+        # pixel on ascending and descending axes, including out-of-range
+        # values and equidistant ties
+        values = np.linspace(-50, 50, 101)
+        for data in (values, values[::-1]):
+            xarr = units.SpectroscopicAxis(np.copy(data)*u.km/u.s)
+            for xval in (-60, -50, -12.3, -0.5, 0, 0.49, 0.5, 17.2, 50, 60):
+                expected = np.argmin(np.abs(data - xval))
+                assert xarr.x_to_pix(xval*u.km/u.s) == expected
+
+    def test_crop_velocity_after_refX_assignment(self):
+        # x_to_pix must rebuild the equivalencies from the current
+        # refX/velocity_convention; the cached ones predate these
+        # assignments and can't convert km/s -> GHz
+        import warnings
+        with warnings.catch_warnings():
+            # ignore warning about creating an empty header
+            warnings.simplefilter('ignore')
+            sp = pyspeckit.Spectrum(xarr=np.linspace(100.0, 100.1, 100)*u.GHz,
+                                    data=np.zeros(100))
+        sp.xarr.refX = 100.05*u.GHz
+        sp.xarr.velocity_convention = 'radio'
+        velo = np.asarray(sp.xarr.as_unit('km/s'))
+        x1pix = np.argmin(np.abs(velo - (-50)))
+        x2pix = np.argmin(np.abs(velo - 50))
+        sp.crop(-5e4, 5e4, unit='m/s')
+        assert sp.data.size == abs(x2pix - x1pix)
+
     def test_comparison(self):
         # regression test for issue 153
 
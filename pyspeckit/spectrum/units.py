@@ -600,9 +600,33 @@ class SpectroscopicAxis(u.Quantity):
                 xval = u.Quantity(xval, xval_unit or self.unit)
 
             if equivalencies is None:
-                equivalencies = self.equivalencies
-
-            nearest_pix = np.argmin(np.abs(self-xval.to(self.unit, equivalencies)))
+                # rebuild from the current refX / velocity_convention, as
+                # as_unit does; the cached self.equivalencies may predate
+                # an assignment of either attribute
+                _, equivalencies = self.find_equivalencies(
+                    self.velocity_convention, self.refX, self.equivalencies)
+
+            xval = xval.to(self.unit, equivalencies).value
+            xdata = self.value
+
+            if xdata.size > 1 and not hasattr(self, '_monotonic'):
+                self.make_dxarr()
+
+            if xdata.size > 1 and np.ndim(xval) == 0 and self._monotonic != 0:
+                # binary search for the nearest pixel on a monotonic axis;
+                # avoids building an N-sized |self - xval| temporary array
+                if self._monotonic > 0:
+                    ind = np.searchsorted(xdata, xval)
+                else:
+                    ind = xdata.size - np.searchsorted(xdata[::-1], xval)
+                lo = min(max(ind - 1, 0), xdata.size - 1)
+                hi = min(ind, xdata.size - 1)
+                if abs(xval - xdata[lo]) <= abs(xdata[hi] - xval):
+                    nearest_pix = lo
+                else:
+                    nearest_pix = hi
+            else:
+                nearest_pix = np.argmin(np.abs(xdata - xval))
 
             return nearest_pix
 
@@ -674,6 +698,8 @@ class SpectroscopicAxis(u.Quantity):
         elif hasattr(self, '_dxarr'):
             # remove the old, wrong one
             del self._dxarr
+            if hasattr(self, '_monotonic'):
+                del self._monotonic
 
 
     def as_unit(self, unit, equivalencies=[], velocity_convention=None, refX=None,
@@ -767,6 +793,16 @@ class SpectroscopicAxis(u.Quantity):
         else:
             raise ValueError("Invalid coordinate location.")
         self._dxarr._unit = self.unit
+        # cache the gradient's sign: +1/-1 for monotonically
+        # ascending/descending axes, 0 otherwise.  x_to_pix uses this to
+        # decide whether a binary search is possible.
+        dxv = np.asarray(self._dxarr.value)
+        if np.all(dxv > 0):
+            self._monotonic = 1
+        elif np.all(dxv < 0):
+            self._monotonic = -1
+        else:
+            self._monotonic = 0
 
     def cdelt(self, tolerance=1e-8, approx=False):
         """
@@ -907,6 +943,8 @@ class SpectroscopicAxis(u.Quantity):
         # any slice needs to regenerate its dxarr
         if hasattr(view, '_dxarr'):
             del view._dxarr
+        if hasattr(view, '_monotonic'):
+            del view._monotonic
 
         #DEBUG print("unit is {1}, self.unit is {2}, class is {0}, viewtype={3}".format(subclass, unit, self.unit, type(view)))
         return view